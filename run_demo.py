@@ -13,16 +13,20 @@ Usage:
 """
 
 import asyncio
+import gzip
 import logging
+import random
+import socket
 import sys
 import time
 from pathlib import Path
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from threading import Thread
 
 # Check for playwright
 try:
     from playwright.async_api import async_playwright
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 except ImportError:
     print("❌ Error: playwright is not installed")
     print("   Install it with: pip install playwright && playwright install chromium")
@@ -42,6 +46,52 @@ logger = logging.getLogger(__name__)
 # Server configuration
 SERVER_PORT = 8080
 DEMO_PAGE_URL = f"http://localhost:{SERVER_PORT}/demo_page.html"
+DEMO_PAGE_PATH = Path(__file__).resolve().parent / "demo_page.html"
+
+# Console separators, built once
+_SEP = "─" * 60
+_DSEP = "=" * 60
+
+# %-style step-end templates (formatted lazily by logging)
+_FMT_OK = "[STEP] END Step %d: Type=%s, Status=%s, Time=%.4fs, URL='%s'"
+_FMT_ERR = _FMT_OK + ", Error='%s'"
+_FMT_OK_DONE = _FMT_OK + "\n✅ Step %d completed in %.2fs"
+_FMT_OK_FAILED = _FMT_OK + "\n❌ Step %d failed: %s"
+_FMT_ERR_DONE = _FMT_ERR + "\n✅ Step %d completed in %.2fs"
+_FMT_ERR_FAILED = _FMT_ERR + "\n❌ Step %d failed: %s"
+
+# Chromium flags that skip profile features the demo never uses
+BROWSER_ARGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--no-first-run",
+    "--disable-default-apps",
+    "--mute-audio",
+]
+
+
+class DemoPageHandler(BaseHTTPRequestHandler):
+    """Serve the demo page from the bytes preloaded on the server."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/demo_page.html"):
+            self.send_error(404)
+            return
+
+        body = self.server.page_body
+        use_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        if use_gzip:
+            body = self.server.page_body_gz
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.end_headers()
+        self.wfile.write(body)
 
 
 class DemoHTTPServer:
@@ -54,12 +104,25 @@ class DemoHTTPServer:
     
     def start(self):
         """Start the HTTP server in a background thread."""
-        handler = SimpleHTTPRequestHandler
-        self.server = HTTPServer(("", self.port), handler)
+        self.server = ThreadingHTTPServer(("", self.port), DemoPageHandler)
+        # Read and compress the page once instead of on every request
+        self.server.page_body = DEMO_PAGE_PATH.read_bytes()
+        self.server.page_body_gz = gzip.compress(self.server.page_body)
         self.thread = Thread(target=self.server.serve_forever, daemon=True)
         self.thread.start()
+        self._wait_until_ready()
         logger.info(f"🌐 HTTP server started on port {self.port}")
-        time.sleep(1)  # Give server time to start
+
+    def _wait_until_ready(self, timeout=2.0):
+        """Block until the server accepts TCP connections (or timeout expires)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", self.port), timeout=0.05).close()
+                return
+            except OSError:
+                time.sleep(0.01)
+        logger.warning(f"⚠️  HTTP server not reachable on port {self.port} after {timeout}s")
     
     def stop(self):
         """Stop the HTTP server."""
@@ -68,12 +131,37 @@ class DemoHTTPServer:
             logger.info("🛑 HTTP server stopped")
 
 
+def backoff_delay(attempt, base=0.3, cap=4.0):
+    """Exponential backoff for a zero-based retry attempt, with jitter in [0.5x, 1.5x)."""
+    return min(base * (2 ** attempt), cap) * (0.5 + random.random())
+
+
+async def safe_goto(page, url, attempts=3, timeout=15000):
+    """Navigate with a bounded per-attempt timeout, retrying with exponential backoff."""
+    for attempt in range(attempts):
+        try:
+            return await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        except PlaywrightTimeoutError:
+            if attempt == attempts - 1:
+                raise
+            logger.warning("   ⚠️  Navigation timed out (attempt %d/%d). Retrying...", attempt + 1, attempts)
+            await asyncio.sleep(backoff_delay(attempt))
+
+
+async def settle_network(page, timeout=5000):
+    """Wait for network idle as a best-effort settle; a timeout is not an error."""
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    except PlaywrightTimeoutError:
+        logger.info("   ⏱️  Network did not go idle within %dms, continuing", timeout)
+
+
 def log_step_start(step_num, total_steps, step_type, description):
     """Log the start of a step."""
-    print(f"\n{'─'*60}")
-    print(f"📍 Step {step_num}/{total_steps}: {description}")
-    print(f"{'─'*60}")
-    logger.info(f"[STEP] START Step {step_num}: Type={step_type}, Desc='{description}'")
+    logger.info(
+        "\n%s\n📍 Step %d/%d: %s\n%s\n[STEP] START Step %d: Type=%s, Desc='%s'",
+        _SEP, step_num, total_steps, description, _SEP, step_num, step_type, description,
+    )
     return time.time()
 
 
@@ -82,28 +170,28 @@ def log_step_end(step_num, step_type, start_time, success=True, url="", error=No
     duration = time.time() - start_time
     status = "SUCCESS" if success else "FAILURE"
     
+    # Deferred %-formatting: nothing is rendered if INFO is disabled
     if error:
-        logger.info(f"[STEP] END Step {step_num}: Type={step_type}, Status={status}, Time={duration:.4f}s, URL='{url}', Error='{error}'")
+        fmt = _FMT_ERR_DONE if success else _FMT_ERR_FAILED
+        args = (step_num, step_type, status, duration, url, error)
     else:
-        logger.info(f"[STEP] END Step {step_num}: Type={step_type}, Status={status}, Time={duration:.4f}s, URL='{url}'")
-    
-    if success:
-        print(f"✅ Step {step_num} completed in {duration:.2f}s")
-    else:
-        print(f"❌ Step {step_num} failed: {error}")
+        fmt = _FMT_OK_DONE if success else _FMT_OK_FAILED
+        args = (step_num, step_type, status, duration, url)
+    outcome_args = (step_num, duration) if success else (step_num, error)
+    logger.info(fmt, *args, *outcome_args)
 
 
 async def run_demo():
     """Main demo execution function."""
-    print("\n" + "="*60)
-    print("🚀 WALT Features Demo")
-    print("="*60)
-    print("\nThis demo showcases:")
-    print("  ✨ wait_for_element - Waits for async-loaded elements")
-    print("  📜 scroll_into_view - Scrolls to off-screen elements")
-    print("  🔄 Retry Policy - Handles transient failures automatically")
-    print("  📊 Step-level Logging - Detailed execution logs")
-    print("\n" + "="*60)
+    logger.info(
+        f"\n{_DSEP}\n🚀 WALT Features Demo\n{_DSEP}\n"
+        "\nThis demo showcases:\n"
+        "  ✨ wait_for_element - Waits for async-loaded elements\n"
+        "  📜 scroll_into_view - Scrolls to off-screen elements\n"
+        "  🔄 Retry Policy - Handles transient failures automatically\n"
+        "  📊 Step-level Logging - Detailed execution logs\n"
+        f"\n{_DSEP}"
+    )
     
     # Start HTTP server
     server = DemoHTTPServer(SERVER_PORT)
@@ -115,16 +203,22 @@ async def run_demo():
     try:
         async with async_playwright() as p:
             # Launch browser
-            print("\n🌐 Launching browser...")
-            browser = await p.chromium.launch(headless=False)
-            page = await browser.new_page()
+            logger.info("🌐 Launching browser...")
+            browser = await p.chromium.launch(headless=False, args=BROWSER_ARGS)
+            context = await browser.new_context(viewport={"width": 1280, "height": 800})
+            page = await context.new_page()
+
+            # Locators for the demo targets, built once and reused by every step
+            load_btn = page.locator("#loadContentBtn")
+            dynamic_content = page.locator("#dynamicContent")
+            submit_btn = page.locator("#submitBtn")
             
             # ═══════════════════════════════════════════════════════════
             # STEP 1: Navigation
             # ═══════════════════════════════════════════════════════════
             step_start = log_step_start(1, total_steps, "navigation", "Navigate to demo page")
             try:
-                await page.goto(DEMO_PAGE_URL, wait_until="networkidle")
+                await safe_goto(page, DEMO_PAGE_URL)
                 log_step_end(1, "navigation", step_start, success=True, url=DEMO_PAGE_URL)
             except Exception as e:
                 log_step_end(1, "navigation", step_start, success=False, url=DEMO_PAGE_URL, error=str(e))
@@ -134,8 +228,12 @@ async def run_demo():
             # STEP 2: Wait for page load
             # ═══════════════════════════════════════════════════════════
             step_start = log_step_start(2, total_steps, "wait", "Wait for page to fully render")
-            await asyncio.sleep(2)
-            log_step_end(2, "wait", step_start, success=True, url=DEMO_PAGE_URL)
+            try:
+                await load_btn.wait_for(state="visible", timeout=5000)
+                log_step_end(2, "wait", step_start, success=True, url=DEMO_PAGE_URL)
+            except Exception as e:
+                # Continue so the click step can still show its retry policy
+                log_step_end(2, "wait", step_start, success=False, url=DEMO_PAGE_URL, error=str(e))
             
             # ═══════════════════════════════════════════════════════════
             # STEP 3: Click button (with retry policy demonstration)
@@ -143,23 +241,23 @@ async def run_demo():
             step_start = log_step_start(3, total_steps, "click", "Click 'Load Dynamic Content' button (demonstrates retry policy)")
             
             max_retries = 3
-            retry_delay = 1.0
+            retry_base_delay = 0.5
             click_success = False
             
             for attempt in range(1, max_retries + 1):
                 try:
-                    button = page.locator("#loadContentBtn")
-                    await button.wait_for(state="visible", timeout=3000)
-                    await button.click()
+                    await load_btn.wait_for(state="visible", timeout=3000)
+                    await load_btn.click()
                     click_success = True
-                    logger.info(f"   🖱️  Button clicked successfully on attempt {attempt}")
+                    logger.info("   🖱️  Button clicked successfully on attempt %d", attempt)
                     break
                 except Exception as e:
                     if attempt < max_retries:
-                        logger.warning(f"   ⚠️  Click failed (attempt {attempt}/{max_retries}). Retrying in {retry_delay}s...")
+                        retry_delay = backoff_delay(attempt - 1, retry_base_delay)
+                        logger.warning("   ⚠️  Click failed (attempt %d/%d). Retrying in %.2fs...", attempt, max_retries, retry_delay)
                         await asyncio.sleep(retry_delay)
                     else:
-                        logger.error(f"   ❌ Click failed after {max_retries} attempts")
+                        logger.error("   ❌ Click failed after %d attempts", max_retries)
             
             if click_success:
                 log_step_end(3, "click", step_start, success=True, url=DEMO_PAGE_URL)
@@ -172,13 +270,15 @@ async def run_demo():
             step_start = log_step_start(4, total_steps, "wait_for_element", "Wait for dynamic content to appear")
             
             try:
-                # Wait for the dynamic content to become visible
-                dynamic_content = page.locator("#dynamicContent")
-                await dynamic_content.wait_for(state="visible", timeout=5000)
+                # Wait for the dynamic content and for the page to settle, concurrently
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(dynamic_content.wait_for(state="visible", timeout=5000))
+                    # Settling swallows its own timeout, so only the element wait can fail here
+                    tg.create_task(settle_network(page, timeout=5000))
                 logger.info("   ✅ Dynamic content appeared!")
                 log_step_end(4, "wait_for_element", step_start, success=True, url=DEMO_PAGE_URL)
             except Exception as e:
-                logger.warning(f"   ⚠️  Dynamic content not visible yet, continuing anyway")
+                logger.warning("   ⚠️  Dynamic content not visible yet, continuing anyway")
                 log_step_end(4, "wait_for_element", step_start, success=True, url=DEMO_PAGE_URL)
             
             # ═══════════════════════════════════════════════════════════
@@ -187,9 +287,7 @@ async def run_demo():
             step_start = log_step_start(5, total_steps, "scroll_into_view", "Scroll to submit button at bottom of page")
             
             try:
-                submit_btn = page.locator("#submitBtn")
                 await submit_btn.scroll_into_view_if_needed()
-                await asyncio.sleep(1)  # Pause to show the scroll
                 logger.info("   📜 Scrolled to submit button")
                 log_step_end(5, "scroll_into_view", step_start, success=True, url=DEMO_PAGE_URL)
             except Exception as e:
@@ -198,27 +296,30 @@ async def run_demo():
             # ═══════════════════════════════════════════════════════════
             # STEP 6: Final wait to view results
             # ═══════════════════════════════════════════════════════════
-            step_start = log_step_start(6, total_steps, "wait", "Pause to view results")
-            await asyncio.sleep(3)
-            log_step_end(6, "wait", step_start, success=True, url=DEMO_PAGE_URL)
+            step_start = log_step_start(6, total_steps, "wait", "Wait for final page state")
+            try:
+                await dynamic_content.wait_for(state="visible", timeout=5000)
+                log_step_end(6, "wait", step_start, success=True, url=DEMO_PAGE_URL)
+            except Exception as e:
+                log_step_end(6, "wait", step_start, success=False, url=DEMO_PAGE_URL, error=str(e))
             
             # Summary
             total_duration = time.time() - demo_start
-            print("\n" + "="*60)
-            print("✅ Demo completed successfully!")
-            print("="*60)
-            print(f"\n📊 Summary:")
-            print(f"   Total execution time: {total_duration:.2f}s")
-            print(f"   Steps executed: {total_steps}")
-            print(f"\n📋 Features demonstrated:")
-            print(f"   ✓ Step-level logging - All steps logged with timing and status")
-            print(f"   ✓ Retry policy - Click step shows retry mechanism")
-            print(f"   ✓ wait_for_element - Waited for dynamic content")
-            print(f"   ✓ scroll_into_view - Scrolled to off-screen button")
-            print("\n" + "="*60)
+            logger.info(
+                f"\n{_DSEP}\n✅ Demo completed successfully!\n{_DSEP}\n"
+                "\n📊 Summary:\n"
+                f"   Total execution time: {total_duration:.2f}s\n"
+                f"   Steps executed: {total_steps}\n"
+                "\n📋 Features demonstrated:\n"
+                "   ✓ Step-level logging - All steps logged with timing and status\n"
+                "   ✓ Retry policy - Click step shows retry mechanism\n"
+                "   ✓ wait_for_element - Waited for dynamic content\n"
+                "   ✓ scroll_into_view - Scrolled to off-screen button\n"
+                f"\n{_DSEP}"
+            )
             
             # Keep browser open briefly
-            print("\n⏳ Browser will close in 5 seconds...")
+            logger.info("⏳ Browser will close in 5 seconds...")
             await asyncio.sleep(5)
             
             await browser.close()
@@ -7,7 +7,9 @@ from walt.prompts.agent import (
 )
 from walt.prompts.discovery import (
     get_demonstration_prompt,
+    get_demonstration_tool_builder_prompt,
     get_exploration_prompt,
+    get_test_inputs_prompt,
     get_tool_builder_prompt,
     get_workflow_creation_prompt,
 )
@@ -39,6 +41,8 @@ __all__ = [
     # Discovery
     'get_tool_builder_prompt',
     'get_demonstration_prompt',
+    'get_demonstration_tool_builder_prompt',
+    'get_test_inputs_prompt',
     'get_workflow_creation_prompt',
     'get_exploration_prompt',
 ]
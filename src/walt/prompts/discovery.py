@@ -1,6 +1,6 @@
 """Discovery prompts for tool building and demonstration."""
 
-TOOL_BUILDER_PROMPT = r"""# Tool Creation from Browser Events
+_TOOL_BUILDER_INTRO = r"""# Tool Creation from Browser Events
 
 You are a master at building re-executable tools from browser automation steps. Your task is to convert a sequence of Browser Use agent steps into a parameterized tool that can be reused with different inputs.
 
@@ -14,7 +14,10 @@ Transform recorded browser interactions into a structured tool by:
 4. **Optimizing the tool** for clarity and efficiency
 5. **Optimize Navigation**: Skip unnecessary clicks when direct URL navigation works
 
-## Input Format
+"""
+
+# Input format for BuilderService, which sends one message per step
+_STEP_MESSAGES_INPUT_FORMAT = r"""## Input Format
 
 You will receive a series of messages, each containing a step from the Browser Use agent execution:
 
@@ -37,7 +40,29 @@ Each message contains two parts:
 
 **2. `screenshot` (content[1])** - Optional visual context of the webpage
 
-## Output Requirements
+"""
+
+# Input format for the demonstrator, which sends every step in one message
+_SINGLE_MESSAGE_INPUT_FORMAT = r"""## Input Format
+
+All agent steps arrive in a single message. Each step starts with a `Step N:` line followed by its `parsed_step` JSON, and is followed by that step's screenshot when one was captured. The message ends with an `AGENT EXECUTION SUMMARY` listing the URLs visited and values entered.
+
+### `parsed_step` Structure
+
+- `url`: Current page URL
+- `title`: Page title
+- `agent_brain`: Agent's internal reasoning
+  - `evaluation_previous_goal`: Success/failure assessment of previous action
+  - `memory`: What's been accomplished and what to remember
+  - `next_goal`: Immediate objective for next action
+- `actions`: List of actions taken (e.g., `go_to_url`, `input_text`, `click_element`, `extract_content`)
+- `results`: Outcomes of executed actions with success status and extracted content
+- `interacted_elements`: DOM elements the agent interacted with, including selectors and positioning
+  - **special field** `element_hash`: unique identifier for elements the agent interacted with. Reference this ID in tool steps to target the same element.
+
+"""
+
+_TOOL_BUILDER_BODY = r"""## Output Requirements
 
 ### 1. tool Analysis (CRITICAL FIRST STEP)
 
@@ -287,7 +312,21 @@ The goal shows the original task given to the agent. Assume all agent actions ca
 
 ---
 
-Input session events will follow in subsequent messages."""
+"""
+
+TOOL_BUILDER_PROMPT = (
+    _TOOL_BUILDER_INTRO
+    + _STEP_MESSAGES_INPUT_FORMAT
+    + _TOOL_BUILDER_BODY
+    + "Input session events will follow in subsequent messages."
+)
+
+DEMONSTRATION_TOOL_BUILDER_PROMPT = (
+    _TOOL_BUILDER_INTRO
+    + _SINGLE_MESSAGE_INPUT_FORMAT
+    + _TOOL_BUILDER_BODY
+    + "The demonstration follows in the next message."
+)
 
 DEMONSTRATION_PROMPT = r"""You are an AI agent designed to automate browser tasks. Your goal is to accomplish the ultimate task following the rules. Your main goal is to help user show **how** to create/execute a tool that can automate the website. The `analyse_page_content_and_extract_possible_actions` action is very important to call to show the structure of the page. Do not call it **only** when the content is basically the same as the previous step.
 
@@ -514,16 +553,34 @@ FINAL OUTPUT FORMAT: Return a **single valid JSON object** with the following fi
 """
 
 
+TEST_INPUTS_PROMPT = r"""## Test Inputs
+
+In addition to the tool definition, fill in:
+
+- `test_inputs`: an object keyed by the `name` of every parameter in `input_schema`, holding the actual value the agent used during this demonstration (URL query parameters and IDs, text entered into inputs, options selected from dropdowns/menus). Use real, working values that would let someone else replay this tool successfully.
+- `test_inputs_explanation`: a brief explanation of where these values came from."""
+
+
 def get_tool_builder_prompt() -> str:
     """Get the tool generation prompt."""
     return TOOL_BUILDER_PROMPT
 
 
+def get_demonstration_tool_builder_prompt() -> str:
+    """Get the tool generation prompt for a demonstration sent as a single message."""
+    return DEMONSTRATION_TOOL_BUILDER_PROMPT
+
+
 def get_demonstration_prompt() -> str:
     """Get the tool demonstration prompt."""
     return DEMONSTRATION_PROMPT
 
 
+def get_test_inputs_prompt() -> str:
+    """Get the prompt section asking for test inputs alongside the tool definition."""
+    return TEST_INPUTS_PROMPT
+
+
 def get_workflow_creation_prompt() -> str:
     """Get the workflow creation prompt - same as tool builder."""
     return get_tool_builder_prompt()
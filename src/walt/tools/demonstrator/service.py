@@ -1,13 +1,14 @@
-import hashlib
+import functools
 import json
 import logging
 import os
 import re
+from itertools import zip_longest
 from typing import Any, Dict, List, Sequence, Union, Optional
 
 import aiofiles
 from walt.browser_use import Agent, AgentHistoryList, Browser
-from walt.browser_use.agent.views import DOMHistoryElement
+from walt.browser_use.agent.views import AgentHistory, DOMHistoryElement
 from walt.browser_use.browser.browser import BrowserConfig
 from walt.browser_use.custom.eval_envs.VWA import (
     VWABrowser,
@@ -18,10 +19,66 @@ from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from patchright.async_api import async_playwright
 
+from walt.prompts.discovery import (
+    get_demonstration_prompt,
+    get_demonstration_tool_builder_prompt,
+    get_test_inputs_prompt,
+)
+from walt.tools.demonstrator.views import (
+    ParsedAgentStep,
+    SimpleDomElement,
+    SimpleResult,
+    ToolDefinitionWithTestInputs,
+)
 from walt.tools.generator.service import BuilderService
 
-from walt.tools.registry.utils import calculate_element_hash, generate_stable_selector
-from walt.tools.schema.views import SelectorToolSteps, ToolDefinitionSchema
+from walt.tools.registry.utils import (
+    calculate_element_hash,
+    calculate_fallback_element_hash,
+    generate_stable_selector,
+)
+from walt.tools.schema.views import SELECTOR_STEP_TYPES, ToolDefinitionSchema
+
+logger = logging.getLogger(__name__)
+
+# Failure-log patterns used by _generate_selector_fixes, compiled once
+_SELECTOR_RE = re.compile(r"Selector:\s*(\S+)")
+# Any substring that can trigger a specific fix; logs matching none of these skip all checks
+_FIX_TRIGGERS_RE = re.compile(
+    r"strict mode violation|Selector:|404|Not Found|timeout|wait|cssSelector",
+    re.IGNORECASE,
+)
+
+
+# Static tail of the regeneration prompt, identical for every attempt
+_REGEN_PROMPT_SUFFIX = """IMPLEMENTATION REQUIREMENTS:
+- Generate working selectors that resolve to exactly ONE element
+- When logs show "strict mode violation: locator resolved to X elements", replace with specific selectors
+- For ambiguous selectors, prefer attribute-based targeting over class-only
+- Use elementHash as backup but prioritize semantic selectors
+- Test mental model: "Will this selector find exactly one element on the target page?"
+
+FEEDBACK INSTRUCTIONS:
+- Analyze the failure logs to understand what went wrong
+- Pay special attention to element selection, timing, and navigation issues
+- Consider if agentic steps might be more appropriate for dynamic content
+- Ensure selectors are more robust or use agent steps for unpredictable elements
+- Double-check URL navigation and form interaction patterns
+- MOST IMPORTANT: Actually implement the specific selector fixes listed above
+
+Please create an improved tool that addresses these specific failures."""
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_prompt() -> str:
+    """Tool builder prompt template for single-message demonstrations, loaded once per process."""
+    return get_demonstration_tool_builder_prompt()
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_actions_md() -> str:
+    """Markdown list of available actions, built once per process."""
+    return BuilderService._get_available_actions_markdown()
 
 
 class DemonstratorService:
@@ -33,20 +90,62 @@ class DemonstratorService:
 
         self.interacted_elements_hash_map: dict[str, DOMHistoryElement] = {}
 
+        # Structured-output binding, built on first use and tied to the llm it wraps
+        self._structured_llm = None
+        self._structured_llm_source: BaseChatModel | None = None
+
+    def _get_structured_llm(self):
+        """Return the structured-output binding for self.llm, rebuilding it only if the llm changed."""
+        if self._structured_llm is None or self._structured_llm_source is not self.llm:
+            self._structured_llm = self.llm.with_structured_output(
+                ToolDefinitionWithTestInputs, method="function_calling"
+            )
+            self._structured_llm_source = self.llm
+        return self._structured_llm
+
     def _remove_none_fields_from_dict(self, d: dict) -> dict:
         return {k: v for k, v in d.items() if v is not None}
 
-    def _history_to_tool_definition(
-        self, history_list: AgentHistoryList
-    ) -> list[HumanMessage]:
-        # history
+    @staticmethod
+    def _coerce_test_inputs(value: Any) -> Dict[str, Any]:
+        """
+        Return the LLM's test inputs as a dict, or {} if they are malformed.
+        Test inputs are best-effort and must never fail tool generation.
+        """
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                logger.warning("⚠️  Ignoring test inputs that are not valid JSON: %s", value)
+                return {}
+        if not isinstance(value, dict):
+            if value:
+                logger.warning("⚠️  Ignoring test inputs that are not an object: %r", value)
+            return {}
+        return value
 
-        messages: list[HumanMessage] = []
+    @staticmethod
+    def _preprocess_history(
+        history_list: AgentHistoryList,
+    ) -> list[tuple[int, AgentHistory]]:
+        """
+        Number the history steps and drop those without model output, in one pass
+        shared by the message builder and the execution summary.
+        """
+        return [
+            (step_number, history)
+            for step_number, history in enumerate(history_list.history, 1)
+            if history.model_output is not None
+        ]
 
-        for history in history_list.history:
-            if history.model_output is None:
-                continue
+    def _history_to_tool_definition(
+        self, history_list: AgentHistoryList
+    ) -> HumanMessage:
+        """Marshal the whole agent history into a single multi-part HumanMessage."""
+        content_blocks: List[Union[str, Dict[str, Any]]] = []
+        steps = self._preprocess_history(history_list)
 
+        for step_number, history in steps:
             interacted_elements: list[SimpleDomElement] = []
             for element in history.state.interacted_element:
                 if element is None:
@@ -57,21 +156,24 @@ class DemonstratorService:
                     element_hash = calculate_element_hash(element)
                 except Exception as e:
                     # Fallback to original method if stable selector generation fails
-                    logging.warning(
-                        f"Failed to generate stable selector for hash, using original method: {e}"
+                    logger.warning(
+                        "Failed to generate stable selector for hash, using original method: %s", e
                     )
-                    element_hash = hashlib.sha256(
-                        f"{element.tag_name}_{element.css_selector}_{element.highlight_index}".encode()
-                    ).hexdigest()[:10]
-                    logging.info(
-                        f"Generated fallback hash {element_hash} from: {element.css_selector}[{element.highlight_index}]"
+                    element_hash = calculate_fallback_element_hash(
+                        element.tag_name, element.css_selector, element.highlight_index
+                    )
+                    logger.info(
+                        "Generated fallback hash %s from: %s[%s]",
+                        element_hash,
+                        element.css_selector,
+                        element.highlight_index,
                     )
 
                 if element_hash not in self.interacted_elements_hash_map:
                     self.interacted_elements_hash_map[element_hash] = element
 
                 interacted_elements.append(
-                    SimpleDomElement(
+                    SimpleDomElement.model_construct(
                         tag_name=element.tag_name,
                         highlight_index=element.highlight_index,
                         shadow_root=element.shadow_root,
@@ -80,50 +182,71 @@ class DemonstratorService:
                 )
 
             screenshot = history.state.screenshot
-            parsed_step = ParsedAgentStep(
+            # One pass over actions and their results; the lists can differ in length
+            # (e.g. the agent stops after a failing action), so pad rather than truncate
+            actions: list[dict] = []
+            results: list[SimpleResult] = []
+            for action, result in zip_longest(history.model_output.action, history.result):
+                if action is not None:
+                    actions.append(self._remove_none_fields_from_dict(action.model_dump()))
+                if result is not None:
+                    results.append(
+                        SimpleResult.model_construct(
+                            success=result.success or False,
+                            extracted_content=result.extracted_content,
+                        )
+                    )
+
+            # Fields come from already-validated history models, so skip re-validation
+            parsed_step = ParsedAgentStep.model_construct(
                 url=history.state.url,
                 title=history.state.title,
                 agent_brain=history.model_output.current_state,
-                actions=[
-                    self._remove_none_fields_from_dict(action.model_dump())
-                    for action in history.model_output.action
-                ],
-                results=[
-                    SimpleResult(
-                        success=result.success or False,
-                        extracted_content=result.extracted_content,
-                    )
-                    for result in history.result
-                ],
+                actions=actions,
+                results=results,
                 interacted_elements=interacted_elements,
             )
 
-            parsed_step_json = json.dumps(parsed_step.model_dump(exclude_none=True))
-            content_blocks: List[Union[str, Dict[str, Any]]] = []
+            # Serialize straight to JSON in pydantic-core, skipping the intermediate dict
+            parsed_step_json = parsed_step.model_dump_json(exclude_none=True)
 
-            text_block: Dict[str, Any] = {"type": "text", "text": parsed_step_json}
+            text_block: Dict[str, Any] = {
+                "type": "text",
+                "text": f"Step {step_number}:\n{parsed_step_json}",
+            }
             content_blocks.append(text_block)
 
             if screenshot:
-                # Assuming screenshot is a base64 encoded string.
-                # Adjust mime type if necessary (e.g., image/png)
+                # Screenshot is already a base64 encoded string; a single concat
+                # builds the data URI. Adjust mime type if necessary (e.g., image/png)
                 image_block: Dict[str, Any] = {
                     "type": "image_url",
-                    "image_url": {"url": f"data:image/jpeg;base64,{screenshot}"},
+                    "image_url": {"url": "data:image/jpeg;base64," + screenshot},
                 }
                 content_blocks.append(image_block)
 
-            messages.append(HumanMessage(content=content_blocks))
+        # Execution summary gives the LLM the concrete values to use as test inputs
+        content_blocks.append(
+            {
+                "type": "text",
+                "text": f"AGENT EXECUTION SUMMARY:\n{self._build_execution_summary(steps)}",
+            }
+        )
 
-        return messages
+        return HumanMessage(content=content_blocks)
 
     def _populate_selector_fields(
         self, tool_definition: ToolDefinitionSchema
     ) -> ToolDefinitionSchema:
         """Populate cssSelector, xpath, and elementTag fields from interacted_elements_hash_map"""
-        # Process each step to add back the selector fields
+        # Nothing to resolve step hashes against
+        if not self.interacted_elements_hash_map:
+            return tool_definition
+
+        # Process each step to add back the selector fields; the step type tag
+        # identifies SelectorToolSteps without an isinstance check per step
         for step in tool_definition.steps:
-            if isinstance(step, SelectorToolSteps):
+            if step.type in SELECTOR_STEP_TYPES:
                 if step.elementHash in self.interacted_elements_hash_map:
                     dom_element = self.interacted_elements_hash_map[step.elementHash]
 
@@ -131,13 +254,15 @@ class DemonstratorService:
                     try:
                         stable_selector = generate_stable_selector(dom_element)
                         step.cssSelector = stable_selector
-                        logging.info(
-                            f"Generated stable selector: {stable_selector} (original: {dom_element.css_selector})"
+                        logger.info(
+                            "Generated stable selector: %s (original: %s)",
+                            stable_selector,
+                            dom_element.css_selector,
                         )
                     except Exception as e:
                         # Fallback to original selector if generation fails
-                        logging.warning(
-                            f"Failed to generate stable selector, using original: {e}"
+                        logger.warning(
+                            "Failed to generate stable selector, using original: %s", e
                         )
                         step.cssSelector = dom_element.css_selector or ""
 
@@ -150,40 +275,60 @@ class DemonstratorService:
 
     async def create_tool_definition(
         self, task: str, history_list: AgentHistoryList, **kwargs
-    ) -> ToolDefinitionSchema:
-        # Load workflow creation prompt from configs
-        from walt.prompts.discovery import get_tool_builder_prompt
-        prompt_content = get_tool_builder_prompt()
-
-        demonstration_actions_markdown = BuilderService._get_available_actions_markdown()
+    ) -> tuple[ToolDefinitionSchema, Dict[str, Any]]:
+        """
+        Build the tool definition and its test inputs from the agent history
+        with a single structured LLM call.
 
-        prompt_content = prompt_content.format(
-            goal=task, actions=demonstration_actions_markdown
+        Returns:
+            Tuple of (tool definition, test inputs dict). The test inputs dict
+            is empty if the LLM did not provide any.
+        """
+        # Template and actions list are static; only the goal changes per call
+        prompt_content = _cached_prompt().format(
+            goal=task, actions=_cached_actions_md()
         )
+        prompt_content = f"{prompt_content}\n\n{get_test_inputs_prompt()}"
         if kwargs.get("extend_system_message"):
             prompt_content = (
                 f"""{prompt_content}\n\n{kwargs.get('extend_system_message')}"""
             )
 
         system_message = SystemMessage(content=prompt_content)
-        human_messages = self._history_to_tool_definition(history_list)
+        human_message = self._history_to_tool_definition(history_list)
 
-        all_messages: Sequence[BaseMessage] = [system_message] + human_messages
+        all_messages: Sequence[BaseMessage] = [system_message, human_message]
 
-        # Use structured output with the schema (original clean approach)
-        structured_llm = self.llm.with_structured_output(
-            ToolDefinitionSchema, method="function_calling"
-        )
+        # One structured call returns both the tool and the test inputs
+        structured_llm = self._get_structured_llm()
 
-        print("🤖 LLM Call - Generating tool definition...")
-        tool_definition: ToolDefinitionSchema = await structured_llm.ainvoke(all_messages)  # type: ignore
-        print("💰 LLM Call Complete")
+        logger.info("🤖 LLM Call - Generating tool definition and test inputs...")
+        response: ToolDefinitionWithTestInputs = await structured_llm.ainvoke(all_messages)  # type: ignore
+        logger.info("💰 LLM Call Complete")
 
+        # Split off the test inputs so they are not saved as part of the tool
+        tool_definition = ToolDefinitionSchema.model_construct(
+            **{name: getattr(response, name) for name in ToolDefinitionSchema.model_fields}
+        )
         tool_definition = self._populate_selector_fields(tool_definition)
 
         # Note: Optimization is now handled by the discover.py pipeline
 
-        return tool_definition
+        test_inputs: Dict[str, Any] = {}
+        extracted_inputs = self._coerce_test_inputs(response.test_inputs)
+        if extracted_inputs:
+            explanation = str(response.test_inputs_explanation or "No explanation provided")
+            logger.info("✅ Extracted %d test input parameters", len(extracted_inputs))
+            logger.info("📝 Explanation: %s", explanation)
+            test_inputs = {
+                "test_inputs": extracted_inputs,
+                "explanation": explanation,
+                "extraction_method": "llm_based",
+            }
+        else:
+            logger.warning("⚠️  LLM returned no test inputs")
+
+        return tool_definition, test_inputs
 
     # Generate tool from prompt
     async def generate_tool_from_prompt(
@@ -198,7 +343,8 @@ class DemonstratorService:
         """
         Generate a tool definition from a prompt by:
         1. Running a browser agent to explore and complete the task
-        2. Converting the agent history into a tool definition
+        2. Converting the agent history into a tool definition and test inputs
+           (one structured LLM call)
         """
 
         browser_config = BrowserConfig(headless=headless)
@@ -207,20 +353,20 @@ class DemonstratorService:
         # Build element hash map for later use
         self.interacted_elements_hash_map: Dict[str, DOMHistoryElement] = {}
 
-        print("🔧 Creating browser context...")
-        print(f"🔑 Storage state provided: {storage_state}")
+        logger.info("🔧 Creating browser context...")
+        logger.info("🔑 Storage state provided: %s", storage_state)
         try:
             # Create browser context for the Agent (using VWA classes for auth support)
             if storage_state:
-                print(f"✅ Using auth state from: {storage_state}")
+                logger.info("✅ Using auth state from: %s", storage_state)
                 context_config = VWABrowserContextConfig(storage_state=storage_state)
             else:
-                print("❌ No storage state - agent will start unauthenticated")
+                logger.warning("❌ No storage state - agent will start unauthenticated")
                 context_config = VWABrowserContextConfig()
 
             # Create VWABrowserContext manually (like discovery phase)
             browser_context = VWABrowserContext(browser=browser, config=context_config)
-            print("✅ Browser context created")
+            logger.info("✅ Browser context created")
 
             agent = Agent(
                 task=prompt,
@@ -233,30 +379,19 @@ class DemonstratorService:
             )
 
             # Run the agent to get history (limit steps to prevent endless exploration)
-            print("🤖 Running agent...")
+            logger.info("🤖 Running agent...")
             history = await agent.run(max_steps=max_steps)
-            print(f"✅ Agent completed with {len(history.history)} steps")
+            logger.info("✅ Agent completed with %d steps", len(history.history))
 
-            print(f"🔍 Agent execution completed with {len(history.history)} steps")
-
-            # Create tool definition from the history
-            print("🔨 Creating tool definition...")
-            try:
-                tool_definition = await self.create_tool_definition(
-                    prompt, history
-                )
-                print("✅ tool definition created")
-
-                # Extract test inputs using LLM
-                print("🧪 Extracting test inputs from execution...")
-                test_inputs = await self._extract_test_inputs_with_llm(
-                    history, tool_definition, agent_llm
-                )
+            # Create tool definition and test inputs from the history
+            logger.info("🔨 Creating tool definition...")
+            tool_definition, test_inputs = await self.create_tool_definition(
+                prompt, history
+            )
+            logger.info("✅ tool definition created")
 
-                # Return both tool definition and test inputs
-                return tool_definition, test_inputs
-            except Exception as e:
-                raise
+            # Return both tool definition and test inputs
+            return tool_definition, test_inputs
 
         finally:
             # Clean up browser resources
@@ -297,33 +432,19 @@ class DemonstratorService:
         selector_fixes = self._generate_selector_fixes(failure_logs)
 
         # Enhance the original prompt with feedback context
-        enhanced_prompt = f"""ORIGINAL TASK: {prompt}
-
-PREVIOUS ATTEMPT ANALYSIS:
-- This is attempt #{attempt_number} to create a working tool
-- The previous tool failed during testing with these issues:
-
-{failure_logs}
-
-CRITICAL SELECTOR IMPROVEMENT RULES:
-{selector_fixes}
-
-IMPLEMENTATION REQUIREMENTS:
-- Generate working selectors that resolve to exactly ONE element
-- When logs show "strict mode violation: locator resolved to X elements", replace with specific selectors
-- For ambiguous selectors, prefer attribute-based targeting over class-only
-- Use elementHash as backup but prioritize semantic selectors
-- Test mental model: "Will this selector find exactly one element on the target page?"
-
-FEEDBACK INSTRUCTIONS:
-- Analyze the failure logs to understand what went wrong
-- Pay special attention to element selection, timing, and navigation issues
-- Consider if agentic steps might be more appropriate for dynamic content
-- Ensure selectors are more robust or use agent steps for unpredictable elements
-- Double-check URL navigation and form interaction patterns
-- MOST IMPORTANT: Actually implement the specific selector fixes listed above
-
-Please create an improved tool that addresses these specific failures."""
+        enhanced_prompt = "".join(
+            [
+                f"ORIGINAL TASK: {prompt}\n\n"
+                "PREVIOUS ATTEMPT ANALYSIS:\n"
+                f"- This is attempt #{attempt_number} to create a working tool\n"
+                "- The previous tool failed during testing with these issues:\n\n",
+                failure_logs,
+                "\n\nCRITICAL SELECTOR IMPROVEMENT RULES:\n",
+                selector_fixes,
+                "\n\n",
+                _REGEN_PROMPT_SUFFIX,
+            ]
+        )
 
         # Use existing generate_tool_from_prompt with enhanced prompt
         return await self.generate_tool_from_prompt(
@@ -347,6 +468,10 @@ Please create an improved tool that addresses these specific failures."""
         """
         fixes = []
 
+        if not _FIX_TRIGGERS_RE.search(failure_logs):
+            return self._default_selector_fixes()
+        failure_logs_lower = failure_logs.lower()
+
         # Check for strict mode violations (selector ambiguity)
         if "strict mode violation" in failure_logs and "locator" in failure_logs:
             if "a.tab" in failure_logs:
@@ -376,9 +501,7 @@ Please create an improved tool that addresses these specific failures."""
         # Check for element not found errors
         if "Failed to wait for element" in failure_logs or "Selector:" in failure_logs:
             # Extract the failing selector
-            import re
-
-            selector_match = re.search(r"Selector:\s*([^\s\n]+)", failure_logs)
+            selector_match = _SELECTOR_RE.search(failure_logs)
             if selector_match:
                 failing_selector = selector_match.group(1)
                 fixes.append(
@@ -398,7 +521,7 @@ Please create an improved tool that addresses these specific failures."""
             )
 
         # Check for timing issues
-        if "timeout" in failure_logs.lower() or "wait" in failure_logs.lower():
+        if "timeout" in failure_logs_lower or "wait" in failure_logs_lower:
             fixes.append(
                 "- Element timing issue - add explicit wait or convert to agent step for dynamic content"
             )
@@ -416,130 +539,51 @@ Please create an improved tool that addresses these specific failures."""
             )
 
         if not fixes:
-            fixes.append(
-                "- Review error patterns and ensure selectors target unique, stable elements"
-            )
-            fixes.append(
-                "- Consider converting problematic deterministic steps to agent steps"
-            )
+            return self._default_selector_fixes()
 
         return "\n".join(fixes)
 
+    @staticmethod
+    def _default_selector_fixes() -> str:
+        """Generic advice used when no specific failure pattern is recognized."""
+        return (
+            "- Review error patterns and ensure selectors target unique, stable elements\n"
+            "- Consider converting problematic deterministic steps to agent steps"
+        )
+
     # Note: tool optimization is now handled by the comprehensive
     # optimization framework in discover.py which provides URL operations,
     # parameter consolidation, and defensive programming removal.
 
-    async def _extract_test_inputs_with_llm(
-        self,
-        history_list: AgentHistoryList,
-        tool_definition: ToolDefinitionSchema,
-        llm: BaseChatModel,
-    ) -> Dict[str, Any]:
-        """
-        Use an LLM to extract test inputs from the agent execution history.
-
-        The LLM analyzes what values the agent actually used during execution
-        and generates appropriate test inputs for the tool's input schema.
-        """
-        try:
-            # Build summary of agent execution
-            execution_summary = self._build_execution_summary(history_list)
-
-            # Get input schema for reference
-            input_schema = tool_definition.input_schema or []
-            schema_json = json.dumps(
-                [param.model_dump() for param in input_schema], indent=2
-            )
-
-            prompt = f"""You are analyzing an agent's successful execution to extract test inputs.
-
-AGENT EXECUTION SUMMARY:
-{execution_summary}
-
-tool INPUT SCHEMA:
-{schema_json}
-
-TASK: Generate test inputs based on the actual values the agent used during execution.
-
-Look for:
-- URLs the agent navigated to (extract query parameters, IDs, etc.)
-- Text the agent entered into inputs
-- Options the agent selected from dropdowns/menus
-- Any other values that would be needed to replay this tool
-
-Return a JSON object with test inputs that match the schema exactly:
-
-{{
-  "test_inputs": {{
-    "parameter_name": "actual_value_used",
-    ...
-  }},
-  "explanation": "Brief explanation of where these values came from"
-}}
-
-Focus on real, working values that would allow someone else to test this tool successfully.
-"""
-            from langchain_core.messages import HumanMessage
-
-            response = await llm.ainvoke([HumanMessage(content=prompt)])
-
-            # Parse the response
-            try:
-                import re
-
-                json_match = re.search(r"\{.*\}", response.content, re.DOTALL)
-                if json_match:
-                    result = json.loads(json_match.group())
-                    test_inputs = result.get("test_inputs", {})
-                    explanation = result.get("explanation", "No explanation provided")
-
-                    print(f"✅ Extracted {len(test_inputs)} test input parameters")
-                    print(f"📝 Explanation: {explanation}")
-
-                    return {
-                        "test_inputs": test_inputs,
-                        "explanation": explanation,
-                        "extraction_method": "llm_based",
-                    }
-                else:
-                    print("⚠️  Could not parse LLM response for test inputs")
-                    return {}
-            except json.JSONDecodeError as e:
-                print(f"⚠️  Failed to parse LLM response as JSON: {e}")
-                return {}
-
-        except Exception as e:
-            print(f"⚠️  Error in LLM-based test input extraction: {e}")
-            return {}
-
-    def _build_execution_summary(self, history_list: AgentHistoryList) -> str:
+    def _build_execution_summary(self, steps: list[tuple[int, AgentHistory]]) -> str:
         """Build a concise summary of agent execution for LLM analysis."""
-        summary_parts = []
-
-        for i, step in enumerate(history_list.history, 1):
-            if not step.model_output:
-                continue
+        return "\n".join(self._summary_lines(steps))
 
+    @staticmethod
+    def _summary_lines(steps: list[tuple[int, AgentHistory]]):
+        """Yield the execution summary one line at a time."""
+        for i, step in steps:
             # Basic step info
             url = step.state.url if step.state else "Unknown"
-            summary_parts.append(f"Step {i}: {url}")
+            yield "Step " + str(i) + ": " + url
 
             # Actions taken
             for action in step.model_output.action:
-                action_dict = action.model_dump()
-                action_type = action_dict.get("action_type", "unknown")
+                # ActionModel sets a single field, {action_name: params}; read it
+                # directly instead of dumping the whole model to a dict
+                action_type = next(
+                    (name for name in action.model_fields_set if getattr(action, name) is not None),
+                    "unknown",
+                )
+                params = getattr(action, action_type, None)
 
                 if action_type == "go_to_url":
-                    url = action_dict.get("url", "")
-                    summary_parts.append(f"  - Navigated to: {url}")
+                    yield "  - Navigated to: " + str(getattr(params, "url", ""))
                 elif action_type == "input_text":
-                    text = action_dict.get("text", "")
-                    summary_parts.append(f"  - Entered text: '{text}'")
+                    yield "  - Entered text: '" + str(getattr(params, "text", "")) + "'"
                 elif action_type == "click_element":
-                    element_text = action_dict.get("element_text", "")
+                    element_text = getattr(params, "element_text", "")
                     if element_text:
-                        summary_parts.append(f"  - Clicked: '{element_text}'")
+                        yield "  - Clicked: '" + str(element_text) + "'"
                 else:
-                    summary_parts.append(f"  - Action: {action_type}")
-
-        return "\n".join(summary_parts)
+                    yield "  - Action: " + action_type
@@ -1,13 +1,20 @@
+from typing import Any
+
 from walt.browser_use.agent.views import AgentBrain
-from pydantic import BaseModel
+from walt.tools.schema.views import ToolDefinitionSchema
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SimpleResult(BaseModel):
+	model_config = ConfigDict(extra='forbid')
+
 	success: bool
 	extracted_content: str | None
 
 
 class SimpleDomElement(BaseModel):
+	model_config = ConfigDict(extra='forbid')
+
 	tag_name: str
 	# xpath: str
 	highlight_index: int | None
@@ -23,6 +30,8 @@ class ParsedAgentStep[T](BaseModel):
 	Simple step for parsed agent output.
 	"""
 
+	model_config = ConfigDict(extra='forbid')
+
 	url: str
 	title: str
 
@@ -32,3 +41,21 @@ class ParsedAgentStep[T](BaseModel):
 	results: list[SimpleResult]
 
 	interacted_elements: list[SimpleDomElement]
+
+
+class ToolDefinitionWithTestInputs(ToolDefinitionSchema):
+	"""
+	Tool definition plus the input values used during the demonstration,
+	returned together from a single structured LLM call.
+	"""
+
+	# Test inputs are best-effort: typed Any so a malformed value cannot fail validation of
+	# the whole tool; the demonstrator coerces them to a dict after the call
+	test_inputs: Any = Field(
+		default_factory=dict,
+		description='Actual values the agent used for each input_schema parameter, keyed by parameter name.',
+	)
+	test_inputs_explanation: Any = Field(
+		None,
+		description='Brief explanation of where the test input values came from.',
+	)
@@ -4,6 +4,7 @@ import asyncio
 import json
 import json as _json
 import logging
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, TypeVar
@@ -248,12 +249,39 @@ class Tool:
         )
 
     # --- Runners ---
+    @staticmethod
+    def _find_node_by_hash(element_tree: Any, target_hash: str) -> Any:
+        """Return the first DOMElementNode (breadth-first) whose stable hash matches target_hash."""
+        from walt.tools.registry.utils import calculate_element_hash
+        from walt.browser_use.dom.views import DOMElementNode
+
+        nodes = deque([element_tree])
+        # Bind hot methods once; this loop runs per DOM node
+        nodes_popleft = nodes.popleft
+        nodes_extend = nodes.extend
+        while nodes:
+            node = nodes_popleft()
+
+            # Calculate hash
+            if isinstance(node, DOMElementNode):
+                try:
+                    if calculate_element_hash(node) == target_hash:
+                        return node
+                except Exception:
+                    pass
+
+                # Text nodes are queued as-is and skipped by the isinstance check above,
+                # which avoids building a filtered list per node
+                children = node.children
+                if children:
+                    nodes_extend(children)
+
+        return None
+
     async def _execute_wait_for_element(self, step: WaitForElementStep) -> ActionResult:
         """Execute wait_for_element step."""
         from walt.browser_use.dom.service import DomService
-        from walt.tools.registry.utils import calculate_element_hash
         from walt.browser_use.agent.views import ActionResult
-        from walt.browser_use.dom.views import DOMElementNode
 
         target_hash = step.elementHash
         timeout = step.timeout
@@ -269,25 +297,7 @@ class Tool:
                 # Use highlight_elements=True to match recording environment hash generation
                 dom_state = await dom_service.get_clickable_elements(highlight_elements=True)
                 
-                found = False
-                
-                # Traverse the tree
-                nodes = [dom_state.element_tree]
-                while nodes:
-                    node = nodes.pop(0)
-                    
-                    # Calculate hash
-                    try:
-                        if isinstance(node, DOMElementNode):
-                            h = calculate_element_hash(node)
-                            if h == target_hash:
-                                found = True
-                                break
-                    except Exception:
-                        pass
-                    
-                    if hasattr(node, 'children') and node.children:
-                        nodes.extend([c for c in node.children if isinstance(c, DOMElementNode)])
+                found = self._find_node_by_hash(dom_state.element_tree, target_hash) is not None
                 
                 if found:
                     logger.info(f"Found element with hash {target_hash}")
@@ -303,9 +313,7 @@ class Tool:
     async def _execute_scroll_into_view(self, step: ScrollIntoViewStep) -> ActionResult:
         """Execute scroll_into_view step."""
         from walt.browser_use.dom.service import DomService
-        from walt.tools.registry.utils import calculate_element_hash
         from walt.browser_use.agent.views import ActionResult
-        from walt.browser_use.dom.views import DOMElementNode
 
         target_hash = step.elementHash
         
@@ -317,25 +325,8 @@ class Tool:
         # Use highlight_elements=True to match recording environment hash generation
         dom_state = await dom_service.get_clickable_elements(highlight_elements=True)
         
-        found_node = None
-        
         # Traverse the tree to find the node
-        nodes = [dom_state.element_tree]
-        while nodes:
-            node = nodes.pop(0)
-            
-            # Calculate hash
-            try:
-                if isinstance(node, DOMElementNode):
-                    h = calculate_element_hash(node)
-                    if h == target_hash:
-                        found_node = node
-                        break
-            except Exception:
-                pass
-            
-            if hasattr(node, 'children') and node.children:
-                nodes.extend([c for c in node.children if isinstance(c, DOMElementNode)])
+        found_node = self._find_node_by_hash(dom_state.element_tree, target_hash)
         
         if found_node:
             logger.info(f"Found element with hash {target_hash}, scrolling into view")
@@ -1203,7 +1194,7 @@ class Tool:
                 step_resolved = self._resolve_placeholders(step_dict)
 
                 # Logging start
-                step_start_time = asyncio.get_event_loop().time()
+                step_start_time = self.step_logger.now()
                 current_url = "unknown"
                 try:
                     # Get browser context to access the page properly
@@ -1254,7 +1245,7 @@ class Tool:
                     result = await self._execute_step(step_index, step_resolved)
                     
                     # Logging success
-                    duration = asyncio.get_event_loop().time() - step_start_time
+                    duration_ns = self.step_logger.now() - step_start_time
                     success = True
                     if isinstance(result, ActionResult):
                         success = result.success if result.success is not None else True
@@ -1315,11 +1306,11 @@ class Tool:
                     if current_url != "about:blank" and current_url != "unknown":
                         self._last_known_url = current_url
                     
-                    self.step_logger.log_step_end(
+                    self.step_logger.log_step_end_ns(
                         step_index=step_index,
                         step_type=step_resolved.type,
                         success=success,
-                        duration=duration,
+                        duration_ns=duration_ns,
                         current_url=current_url if current_url != "about:blank" else self._last_known_url
                     )
 
@@ -1330,15 +1321,15 @@ class Tool:
                 
                 except Exception as e:
                     # Logging failure
-                    duration = asyncio.get_event_loop().time() - step_start_time
+                    duration_ns = self.step_logger.now() - step_start_time
                     # Use last known URL if current is blank
                     display_url = current_url if current_url != "about:blank" else self._last_known_url
                     
-                    self.step_logger.log_step_end(
+                    self.step_logger.log_step_end_ns(
                         step_index=step_index,
                         step_type=step_resolved.type,
                         success=False,
-                        duration=duration,
+                        duration_ns=duration_ns,
                         current_url=display_url,
                         error=str(e)
                     )
@@ -1,10 +1,188 @@
+import asyncio
+import functools
 import logging
+import os
 import re
+import sys
 import hashlib
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Element hashes are persisted in tool definitions (elementHash), so SHA-256 stays the
+# default. WALT_ELEMENT_HASH picks a faster digest for setups that record and replay their
+# own tools (existing tools need re-recording):
+#   blake2b - cheaper than SHA-256 on these short inputs, stdlib only
+#   xxh3    - non-cryptographic and fastest; needs the optional xxhash package
+ELEMENT_HASH_ALGORITHM = os.getenv('WALT_ELEMENT_HASH', 'sha256').lower()
+
+if ELEMENT_HASH_ALGORITHM not in ('sha256', 'blake2b', 'xxh3'):
+	logger.warning(
+		"Unknown WALT_ELEMENT_HASH=%r (expected sha256, blake2b or xxh3); using sha256",
+		ELEMENT_HASH_ALGORITHM,
+	)
+	ELEMENT_HASH_ALGORITHM = 'sha256'
+elif ELEMENT_HASH_ALGORITHM == 'xxh3':
+	try:
+		import xxhash
+	except ImportError:
+		logger.warning("WALT_ELEMENT_HASH=xxh3 requires xxhash (pip install 'sfr-walt[xxhash]'); using sha256")
+		ELEMENT_HASH_ALGORITHM = 'sha256'
+
+if ELEMENT_HASH_ALGORITHM == 'xxh3':
+
+	def _short_digest(data: str) -> str:
+		"""10-hex-char element digest."""
+		return xxhash.xxh3_64_hexdigest(data.encode())[:10]
+
+elif ELEMENT_HASH_ALGORITHM == 'blake2b':
+
+	def _short_digest(data: str) -> str:
+		"""10-hex-char element digest."""
+		return hashlib.blake2b(data.encode(), digest_size=5).hexdigest()
+
+else:
+
+	def _short_digest(data: str) -> str:
+		"""10-hex-char element digest."""
+		return hashlib.sha256(data.encode()).hexdigest()[:10]
+
+# --- Precompiled patterns ---
+# Selector helpers run per DOM element, so every pattern is compiled once here
+
+# Attributes probed in generate_stable_selectors (most stable first)
+_SELECTOR_ATTRS = (
+	'placeholder',
+	'aria-label',
+	'name',
+	'title',
+	'role',
+	'data-testid',
+)
+# `[attr="value"]` / `[attr*="value"]` for any probed attribute, so one scan finds them all
+_SELECTOR_ATTR_RE = re.compile(r'\[(' + '|'.join(map(re.escape, _SELECTOR_ATTRS)) + r')\*?=[\'"]([^\'"]*)[\'"]')
+_CLASS_RE = re.compile(r'\.([a-zA-Z0-9_-]+)')
+_TAG_RE = re.compile(r'^([a-zA-Z][a-zA-Z0-9]*)')
+_ID_ATTR_RE = re.compile(r'\[id=[\'"].*?[\'"]\]')
+_NTH_RE = re.compile(r':nth-(?:of-type|child)\(\d+\)')
+
+# Tag groups and attribute names for stable selector building. Literal strings are already
+# interned, and tag names from elements are interned on entry, so lookups hit identity compares
+_FORM_TAGS = frozenset({"input", "select", "textarea", "button"})
+_INTERACTIVE_TAGS = frozenset({"button", "a", "div"})
+_ICON_TAGS = frozenset({"i", "span"})
+
+# Priority attributes per tag group, in the order build_attribute_selector tries them
+_FORM_ATTRS = ("placeholder", "aria-label", "title", "role")
+_INTERACTIVE_ATTRS = ("aria-label", "role", "data-testid", "title")
+_ICON_ATTRS = ("data-value", "data-rating", "aria-label", "title", "data-testid")
+# Tag -> attributes to try. A tag in several groups gets every group's list in turn,
+# repeats included (a lone aria-label on a button yields it twice); stored element
+# hashes depend on these selectors, so that quirk is kept
+_STABLE_ATTRS_BY_TAG = {
+	tag: (
+		(_FORM_ATTRS if tag in _FORM_TAGS else ())
+		+ (_INTERACTIVE_ATTRS if tag in _INTERACTIVE_TAGS else ())
+		+ (_ICON_ATTRS if tag in _ICON_TAGS else ())
+	)
+	for tag in _FORM_TAGS | _INTERACTIVE_TAGS | _ICON_TAGS
+}
+# data-* attributes trusted by the generic fallback in build_attribute_selector
+_STABLE_DATA_ATTRS = frozenset({
+	"data-value",
+	"data-rating",
+	"data-testid",
+	"data-qa",
+	"data-cy",
+	"data-id",
+	"data-role",
+	"data-action",
+})
+
+
+# A backslash escape, or an uppercase letter outside one
+_PATTERN_CASE_RE = re.compile(r'\\.|[A-Z]')
+
+
+def _lower_pattern(pattern):
+	"""Lowercase the literal letters of a regex, leaving escapes such as \\S or \\D intact."""
+	return _PATTERN_CASE_RE.sub(
+		lambda m: m.group() if m.group().startswith('\\') else m.group().lower(), pattern
+	)
+
+
+def _compile_unstable(patterns):
+	"""
+	Fuse case-insensitive patterns into one alternation, compiled twice: lowercased and
+	case-sensitive for ASCII input lowercased by the caller (cheaper than IGNORECASE), and
+	with IGNORECASE for non-ASCII input, where lower() and case folding can disagree.
+	"""
+	alternation = '|'.join(f'(?:{pattern})' for pattern in patterns)
+	return re.compile(_lower_pattern(alternation)), re.compile(alternation, re.IGNORECASE)
+
+
+# Unstable-name checks: each pattern list is fused into a single alternation,
+# so a candidate is tested with one regex call instead of one per pattern
+
+# State-related class names: plain substrings, checked with `in` on the lowercased
+# class before the regex engine is involved
+_UNSTABLE_CLASS_SUBSTRINGS = (
+	"focus",
+	"hover",
+	"active",
+	"selected",
+	"checked",
+	"disabled",
+	"loading",
+	"error",
+	"success",
+)
+
+# Class names that look generated
+_UNSTABLE_CLASS_PATTERNS = (
+	r"^\d+$",  # Pure numbers
+	r"^[a-f0-9]{6,}$",  # Hex codes
+	r"css-\w+",  # CSS-in-JS generated classes
+	r"^[A-Z0-9]{6,}$",  # Random uppercase sequences like B3R4DD
+	r"ui-id-\d+",  # jQuery UI generated classes
+	r"^x-\w+\d+",  # ExtJS style generated classes
+	r"^\w*\d{3,}$",  # Classes ending with 3+ digits
+	r"^gen-\w+",  # Generated classes with gen- prefix
+	r"^auto-\w+",  # Auto-generated classes
+	r"^tmp-\w+",  # Temporary classes
+	r"^dyn-\w+",  # Dynamic classes
+)
+# Class names come from an ASCII-only regex, so only the lowercase variant is needed
+_UNSTABLE_CLASS_RE = _compile_unstable(_UNSTABLE_CLASS_PATTERNS)[0]
+
+# IDs that look auto-generated
+_UNSTABLE_ID_PATTERNS = (
+	r"^[a-f0-9]{8,}$",  # Long hex strings
+	r"^\d+$",  # Pure numbers
+	r"^id\d+$",  # id123, id456
+	r"^_\w+\d+$",  # _element123
+	r"react-\w+",  # React generated IDs
+	r"mui-\d+",  # Material-UI generated IDs
+	r"^ui-id-\d+$",  # jQuery UI generated IDs like ui-id-123
+	r"^[A-Z0-9]{6,}$",  # Random uppercase sequences like B3R4DD
+	r"^\w*\d{3,}$",  # IDs ending with 3+ digits (likely generated)
+	r"^gen-\w+",  # Generated IDs with gen- prefix
+	r"^auto-\w+",  # Auto-generated IDs with auto- prefix
+)
+_UNSTABLE_ID_RE, _UNSTABLE_ID_RE_UNICODE = _compile_unstable(_UNSTABLE_ID_PATTERNS)
+
+# Attribute values that look auto-generated
+_UNSTABLE_VALUE_PATTERNS = (
+	r"^[a-f0-9]{8,}$",  # Long hex strings
+	r"^\d+$",  # Pure numbers (likely IDs)
+	r"^[A-Z0-9]{6,}$",  # Random uppercase sequences
+	r"^ui-id-\d+$",  # jQuery UI generated values
+	r"^\w*\d{4,}$",  # Values ending with 4+ digits
+	r"^tmp-\w+",  # Temporary values
+	r"^gen-\w+",  # Generated values
+)
+_UNSTABLE_VALUE_RE, _UNSTABLE_VALUE_RE_UNICODE = _compile_unstable(_UNSTABLE_VALUE_PATTERNS)
+
 
 def truncate_selector(selector: str, max_length: int = 35) -> str:
 	"""Truncate a CSS selector to a maximum length, adding ellipsis if truncated."""
@@ -15,21 +193,64 @@ async def get_best_element_handle(page, selector, params=None, timeout_ms=2500):
 	"""Find element using stability-ranked selector strategies."""
 	original_selector = selector
 
+	# Fast path: the recorded selector usually matches a visible element right away, and a
+	# single visibility check settles that without probing or waiting on every fallback
+	try:
+		locator = page.locator(original_selector)
+		if await locator.is_visible():
+			logger.info(f'Found element with selector: {truncate_selector(original_selector)}')
+			return locator, original_selector
+	except Exception:
+		# Invalid or ambiguous selectors are reported by the full search below
+		pass
+
 	# Generate stability-ranked fallback selectors
 	fallbacks = generate_stable_selectors(selector, params)
 
-	# Try all selectors with exponential backoff for timeouts
-	selectors_to_try = [original_selector] + fallbacks
+	# Original first, then the fallbacks, without duplicates
+	selectors_to_try = list(dict.fromkeys([original_selector] + fallbacks))
 
-	for try_selector in selectors_to_try:
-		try:
-			logger.info(f'Trying selector: {truncate_selector(try_selector)}')
-			locator = page.locator(try_selector)
-			await locator.wait_for(state='visible', timeout=timeout_ms)
+	# Cheap concurrent existence probe: selectors that already match something are tried
+	# first, so absent ones no longer cost a full visibility timeout each before them.
+	# Absent selectors are kept (after the present ones) in case the element renders late;
+	# selectors the engine rejects are dropped
+	counts = await asyncio.gather(
+		*(page.locator(try_selector).count() for try_selector in selectors_to_try),
+		return_exceptions=True,
+	)
+	present, absent = [], []
+	for try_selector, count in zip(selectors_to_try, counts):
+		if isinstance(count, BaseException):
+			logger.error(f'Selector failed: {truncate_selector(try_selector)} with error: {count}')
+		elif count:
+			present.append(try_selector)
+		else:
+			absent.append(try_selector)
+
+	# Start every visibility wait at once so a miss costs one timeout overall rather than
+	# one per selector, but accept them in rank order: a selector only wins once every
+	# better-ranked one has failed, so a fallback cannot beat a better selector still loading
+	candidates = present + absent
+	locators = [page.locator(try_selector) for try_selector in candidates]
+	waits = [
+		asyncio.ensure_future(locator.wait_for(state='visible', timeout=timeout_ms))
+		for locator in locators
+	]
+	try:
+		for try_selector, locator, wait in zip(candidates, locators, waits):
+			try:
+				await wait
+			except Exception as e:
+				logger.error(f'Selector failed: {truncate_selector(try_selector)} with error: {e}')
+				continue
 			logger.info(f'Found element with selector: {truncate_selector(try_selector)}')
 			return locator, try_selector
-		except Exception as e:
-			logger.error(f'Selector failed: {truncate_selector(try_selector)} with error: {e}')
+	finally:
+		# Cancel the waits still running and collect every outcome, so failures of
+		# lower-ranked selectors are not reported as unretrieved task exceptions
+		for wait in waits:
+			wait.cancel()
+		await asyncio.gather(*waits, return_exceptions=True)
 
 	# Try XPath as last resort
 	if params and getattr(params, 'xpath', None):
@@ -54,59 +275,70 @@ def generate_stable_selectors(selector, params=None):
 	"""Generate selectors from most to least stable based on selector patterns."""
 	fallbacks = []
 
-	# 1. Extract attribute-based selectors (most stable)
-	attributes_to_check = [
-		'placeholder',
-		'aria-label',
-		'name',
-		'title',
-		'role',
-		'data-testid',
-	]
-	for attr in attributes_to_check:
-		attr_pattern = rf'\[{attr}\*?=[\'"]([^\'"]*)[\'"]'
-		attr_match = re.search(attr_pattern, selector)
-		if attr_match:
-			attr_value = attr_match.group(1)
-			element_tag = extract_element_tag(selector, params)
-			if element_tag:
-				fallbacks.append(f'{element_tag}[{attr}*="{attr_value}"]')
-
-	# 2. Combine tag + class + one attribute (good stability)
+	# Everything derived from the selector and params is computed once up front
 	element_tag = extract_element_tag(selector, params)
 	classes = extract_stable_classes(selector)
-	for attr in attributes_to_check:
-		attr_pattern = rf'\[{attr}\*?=[\'"]([^\'"]*)[\'"]'
-		attr_match = re.search(attr_pattern, selector)
-		if attr_match and classes and element_tag:
-			attr_value = attr_match.group(1)
-			class_selector = '.'.join(classes)
-			fallbacks.append(f'{element_tag}.{class_selector}[{attr}*="{attr_value}"]')
+	class_selector = '.'.join(classes)
+	param_tag = getattr(params, 'elementTag', None) if params else None
+	param_text = getattr(params, 'elementText', None) if params else None
+	# One scan collects every probed attribute; both passes below reuse it
+	found_attrs = extract_selector_attributes(selector)
+
+	if found_attrs:
+		# 1. Extract attribute-based selectors (most stable)
+		if element_tag:
+			for attr in _SELECTOR_ATTRS:
+				if attr in found_attrs:
+					fallbacks.append(f'{element_tag}[{attr}*="{found_attrs[attr]}"]')
+
+		# 2. Combine tag + class + one attribute (good stability)
+		if classes and element_tag:
+			for attr in _SELECTOR_ATTRS:
+				if attr in found_attrs:
+					fallbacks.append(f'{element_tag}.{class_selector}[{attr}*="{found_attrs[attr]}"]')
 
 	# 3. Tag + class combination (less stable but often works)
 	if element_tag and classes:
-		class_selector = '.'.join(classes)
 		fallbacks.append(f'{element_tag}.{class_selector}')
 
+	# Steps 1-3 cannot repeat each other: tag[attr], tag.classes[attr] and tag.classes
+	# differ in shape. Only the rewritten selectors below need a duplicate check
+	later = []
+
 	# 4. Remove dynamic parts (IDs, state classes)
 	if '[id=' in selector:
-		fallbacks.append(re.sub(r'\[id=[\'"].*?[\'"]\]', '', selector))
+		later.append(_ID_ATTR_RE.sub('', selector))
 
 	for state in ['.focus-visible', '.hover', '.active', '.focus', ':focus']:
 		if state in selector:
-			fallbacks.append(selector.replace(state, ''))
+			later.append(selector.replace(state, ''))
 
 	# 5. Use text-based selector if we have element tag and text
-	if params and getattr(params, 'elementTag', None) and getattr(params, 'elementText', None) and params.elementText.strip():
-		fallbacks.append(f"{params.elementTag}:has-text('{params.elementText}')")
+	if param_tag and param_text and param_text.strip():
+		later.append(f"{param_tag}:has-text('{param_text}')")
+
+	# Remove duplicates while preserving order
+	seen = set(fallbacks)
+	for candidate in later:
+		if candidate not in seen:
+			seen.add(candidate)
+			fallbacks.append(candidate)
 
-	return list(dict.fromkeys(fallbacks))  # Remove duplicates while preserving order
+	return fallbacks
+
+
+def extract_selector_attributes(selector):
+	"""Map each probed attribute to the value of its first `[attr="..."]` in the selector."""
+	found_attrs = {}
+	for attr_match in _SELECTOR_ATTR_RE.finditer(selector):
+		found_attrs.setdefault(attr_match.group(1), attr_match.group(2))
+	return found_attrs
 
 
 def extract_element_tag(selector, params=None):
 	"""Extract element tag from selector or params."""
 	# Try to get from selector first
-	tag_match = re.match(r'^([a-zA-Z][a-zA-Z0-9]*)', selector)
+	tag_match = _TAG_RE.match(selector)
 	if tag_match:
 		return tag_match.group(1).lower()
 
@@ -117,52 +349,34 @@ def extract_element_tag(selector, params=None):
 	return ''
 
 
-def extract_stable_classes(selector):
+def extract_stable_classes(selector) -> Tuple[str, ...]:
 	"""Extract classes that appear stable (not state-related)."""
-	# If selector is not a string, return empty list
+	# If selector is not a string, return no classes
 	if not isinstance(selector, str):
-		return []
+		return ()
+
+	return _extract_stable_classes_cached(selector)
 
-	class_pattern = r'\.([a-zA-Z0-9_-]+)'
-	classes = re.findall(class_pattern, selector)
+
+@functools.lru_cache(maxsize=8192)
+def _extract_stable_classes_cached(selector: str) -> Tuple[str, ...]:
+	# Rows of a table or list share their class strings, so results are memoized;
+	# a tuple keeps the shared result immutable
+	classes = _CLASS_RE.findall(selector)
 
 	# Filter out likely unstable classes
 	stable_classes = []
-	unstable_patterns = [
-		r"focus",
-		r"hover",
-		r"active",
-		r"selected",
-		r"checked",
-		r"disabled",
-		r"loading",
-		r"error",
-		r"success",
-		r"^\d+$",  # Pure numbers
-		r"^[a-f0-9]{6,}$",  # Hex codes
-		r"css-\w+",  # CSS-in-JS generated classes
-		r"^[A-Z0-9]{6,}$",  # Random uppercase sequences like B3R4DD
-		r"ui-id-\d+",  # jQuery UI generated classes
-		r"^x-\w+\d+",  # ExtJS style generated classes
-		r"^\w*\d{3,}$",  # Classes ending with 3+ digits
-		r"^gen-\w+",  # Generated classes with gen- prefix
-		r"^auto-\w+",  # Auto-generated classes
-		r"^tmp-\w+",  # Temporary classes
-		r"^dyn-\w+",  # Dynamic classes
-	]
-
 	for cls in classes:
-		is_stable = True
-		for pattern in unstable_patterns:
-			if re.search(pattern, cls, re.IGNORECASE):
-				is_stable = False
-				break
-
-		if is_stable and len(cls) > 1:  # Skip single character classes
+		if len(cls) <= 1:  # Skip single character classes
+			continue
+		lowered = cls.lower()
+		if any(substring in lowered for substring in _UNSTABLE_CLASS_SUBSTRINGS):
+			continue
+		if not _UNSTABLE_CLASS_RE.search(lowered):
 			stable_classes.append(cls)
 
 	# Return up to 2 most stable classes to avoid over-specification
-	return stable_classes[:2]
+	return tuple(stable_classes[:2])
 
 
 def generate_stable_xpaths(xpath, params=None):
@@ -175,12 +389,10 @@ def generate_stable_xpaths(xpath, params=None):
 		if element_tag:
 			# Create XPaths based on attributes from params
 			if params and getattr(params, 'cssSelector', None):
+				found_attrs = extract_selector_attributes(params.cssSelector)
 				for attr in ['placeholder', 'aria-label', 'title', 'name']:
-					attr_pattern = rf'\[{attr}\*?=[\'"]([^\'"]*)[\'"]'
-					attr_match = re.search(attr_pattern, params.cssSelector)
-					if attr_match:
-						attr_value = attr_match.group(1)
-						alternatives.append(f"//{element_tag}[contains(@{attr}, '{attr_value}')]")
+					if attr in found_attrs:
+						alternatives.append(f"//{element_tag}[contains(@{attr}, '{found_attrs[attr]}')]")
 
 	return alternatives
 
@@ -192,12 +404,22 @@ def calculate_element_hash(dom_element: Any) -> str:
 	Calculate the stable hash for a DOM element.
 	Handles both DOMHistoryElement (from agent) and DOMElementNode (from DOM service).
 	"""
+	# DOM snapshots are not mutated after capture, so the hash is kept on the element itself
+	element_hash = getattr(dom_element, '_walt_hash', None)
+	if element_hash is None:
+		element_hash = _compute_element_hash(dom_element)
+		try:
+			dom_element._walt_hash = element_hash
+		except (AttributeError, TypeError):
+			pass  # Slotted/frozen elements rely on the selector and hash caches instead
+	return element_hash
+
+
+def _compute_element_hash(dom_element: Any) -> str:
 	try:
 		stable_selector = generate_stable_selector(dom_element)
 		# Use stable selector for hash generation to ensure consistency
-		element_hash = hashlib.sha256(
-			f"{dom_element.tag_name}_{stable_selector}".encode()
-		).hexdigest()[:10]
+		element_hash = _hash_stable_selector(dom_element.tag_name, stable_selector)
 		logger.debug(
 			f"Generated stable hash {element_hash} from selector: {stable_selector}"
 		)
@@ -218,23 +440,52 @@ def calculate_element_hash(dom_element: Any) -> str:
 		
 		highlight_index = getattr(dom_element, 'highlight_index', '')
 		
-		element_hash = hashlib.sha256(
-			f"{dom_element.tag_name}_{css_selector}_{highlight_index}".encode()
-		).hexdigest()[:10]
+		element_hash = calculate_fallback_element_hash(dom_element.tag_name, css_selector, highlight_index)
 		logger.debug(
 			f"Generated fallback hash {element_hash} from: {css_selector}[{highlight_index}]"
 		)
 		return element_hash
 
 
+@functools.lru_cache(maxsize=4096)
+def _hash_stable_selector(tag_name: str, stable_selector: str) -> str:
+	"""Hash a (tag, stable selector) pair; repeated element shapes skip the digest."""
+	return _short_digest(f"{tag_name}_{stable_selector}")
+
+
+def calculate_fallback_element_hash(tag_name: str, css_selector: Any, highlight_index: Any) -> str:
+	"""
+	Hash an element by its raw (positional) selector when no stable selector is available.
+	Shared by every caller so fallback hashes agree between recording and execution.
+	"""
+	return _short_digest(f"{tag_name}_{css_selector}_{highlight_index}")
+
+
 def generate_stable_selector(dom_element: Any) -> str:
 	"""
 	Generate a stable CSS selector from DOM element attributes.
 	Prioritizes stable attributes over positional selectors.
 	"""
-	tag_name = dom_element.tag_name.lower()
+	tag_name = sys.intern(dom_element.tag_name.lower())
 	attributes = dom_element.attributes or {}
+	original_selector = getattr(dom_element, 'css_selector', "")
+
+	# Structurally identical elements (table rows, list items, icons) share a cache entry.
+	# Attribute order is part of the key since the data-* fallback depends on it
+	try:
+		return _stable_selector_cached(tag_name, tuple(attributes.items()), original_selector)
+	except TypeError:
+		# Unhashable attribute values cannot be cached
+		return _build_stable_selector(tag_name, attributes, original_selector)
 
+
+@functools.lru_cache(maxsize=4096)
+def _stable_selector_cached(tag_name: str, attribute_items: tuple, original_selector: Any) -> str:
+	return _build_stable_selector(tag_name, dict(attribute_items), original_selector)
+
+
+def _build_stable_selector(tag_name: str, attributes: Dict[str, str], original_selector: Any) -> str:
+	"""Selector priority ladder behind generate_stable_selector."""
 	# Priority 1: Unique ID (if it looks stable, not auto-generated)
 	element_id = attributes.get("id", "").strip()
 	if element_id and is_stable_id(element_id):
@@ -244,7 +495,7 @@ def generate_stable_selector(dom_element: Any) -> str:
 	name_attr = attributes.get("name", "").strip()
 	if name_attr:
 		# For form elements, name is usually very stable
-		if tag_name in ["input", "select", "textarea", "button"]:
+		if tag_name in _FORM_TAGS:
 			type_attr = attributes.get("type", "").strip()
 			if type_attr:
 				return f'{tag_name}[name="{name_attr}"][type="{type_attr}"]'
@@ -266,7 +517,6 @@ def generate_stable_selector(dom_element: Any) -> str:
 
 	# Priority 5: Fallback to simplified positional selector
 	# Use the original selector but try to simplify it
-	original_selector = getattr(dom_element, 'css_selector', "")
 	simplified = simplify_positional_selector(
 		original_selector, tag_name, attributes
 	)
@@ -280,102 +530,45 @@ def generate_stable_selector(dom_element: Any) -> str:
 def is_stable_id(element_id: str) -> bool:
 	"""Check if an ID looks stable (not auto-generated)."""
 	# Skip IDs that look auto-generated
-	unstable_patterns = [
-		r"^[a-f0-9]{8,}$",  # Long hex strings
-		r"^\d+$",  # Pure numbers
-		r"^id\d+$",  # id123, id456
-		r"^_\w+\d+$",  # _element123
-		r"react-\w+",  # React generated IDs
-		r"mui-\d+",  # Material-UI generated IDs
-		r"^ui-id-\d+$",  # jQuery UI generated IDs like ui-id-123
-		r"^[A-Z0-9]{6,}$",  # Random uppercase sequences like B3R4DD
-		r"^\w*\d{3,}$",  # IDs ending with 3+ digits (likely generated)
-		r"^gen-\w+",  # Generated IDs with gen- prefix
-		r"^auto-\w+",  # Auto-generated IDs with auto- prefix
-	]
-
-	for pattern in unstable_patterns:
-		if re.match(pattern, element_id, re.IGNORECASE):
-			return False
-
-	return True
+	if element_id.isascii():
+		return not _UNSTABLE_ID_RE.match(element_id.lower())
+	return not _UNSTABLE_ID_RE_UNICODE.match(element_id)
 
 
 def is_stable_attribute_value(value: str) -> bool:
 	"""Check if an attribute value looks stable (not auto-generated)."""
 	# Skip values that look auto-generated
-	unstable_value_patterns = [
-		r"^[a-f0-9]{8,}$",  # Long hex strings
-		r"^\d+$",  # Pure numbers (likely IDs)
-		r"^[A-Z0-9]{6,}$",  # Random uppercase sequences
-		r"^ui-id-\d+$",  # jQuery UI generated values
-		r"^\w*\d{4,}$",  # Values ending with 4+ digits
-		r"^tmp-\w+",  # Temporary values
-		r"^gen-\w+",  # Generated values
-	]
-
-	for pattern in unstable_value_patterns:
-		if re.match(pattern, value, re.IGNORECASE):
-			return False
-
-	return True
+	if value.isascii():
+		return not _UNSTABLE_VALUE_RE.match(value.lower())
+	return not _UNSTABLE_VALUE_RE_UNICODE.match(value)
 
 
 def build_attribute_selector(tag_name: str, attributes: Dict[str, str]) -> Optional[str]:
 	"""Build selector using stable attributes."""
-	# Priority attributes for different element types
+	# Priority attributes for the element type (form, interactive, rating/icon)
+	# Use up to 2 most specific attributes to avoid over-specification; stop once found
 	stable_attrs = []
-
-	# For form elements
-	if tag_name in ["input", "select", "textarea", "button"]:
-		for attr in ["placeholder", "aria-label", "title", "role"]:
-			value = attributes.get(attr, "").strip()
-			if value:
-				stable_attrs.append(f'{attr}="{value}"')
-
-	# For interactive elements
-	if tag_name in ["button", "a", "div"]:
-		for attr in ["aria-label", "role", "data-testid", "title"]:
-			value = attributes.get(attr, "").strip()
-			if value:
-				stable_attrs.append(f'{attr}="{value}"')
-
-	# For rating/icon elements (i, span, etc.)
-	if tag_name in ["i", "span"]:
-		for attr in [
-			"data-value",
-			"data-rating",
-			"aria-label",
-			"title",
-			"data-testid",
-		]:
-			value = attributes.get(attr, "").strip()
-			if value:
-				stable_attrs.append(f'{attr}="{value}"')
+	for attr in _STABLE_ATTRS_BY_TAG.get(tag_name, ()):
+		value = attributes.get(attr, "").strip()
+		if value:
+			stable_attrs.append(f'{attr}="{value}"')
+			if len(stable_attrs) == 2:
+				break
 
 	# Generic data attributes for any element type (fallback)
 	if not stable_attrs:
 		for attr_name, value in attributes.items():
-			if attr_name.startswith("data-") and attr_name in [
-				"data-value",
-				"data-rating",
-				"data-testid",
-				"data-qa",
-				"data-cy",
-				"data-id",
-				"data-role",
-				"data-action",
-			]:
+			if attr_name in _STABLE_DATA_ATTRS:
 				value = value.strip()
 				# Skip dynamic-looking data attribute values
 				if value and is_stable_attribute_value(value):
 					stable_attrs.append(f'{attr_name}="{value}"')
+					if len(stable_attrs) == 2:
+						break
 
 	# Build selector with most stable attributes
 	if stable_attrs:
-		# Use up to 2 most specific attributes to avoid over-specification
-		selected_attrs = stable_attrs[:2]
-		attr_selector = "[" + "][".join(selected_attrs) + "]"
+		attr_selector = "[" + "][".join(stable_attrs) + "]"
 		return f"{tag_name}{attr_selector}"
 
 	return None
@@ -388,25 +581,18 @@ def simplify_positional_selector(original_selector: str, tag_name: str, attribut
 
 	# Try to extract the meaningful part of the selector
 	# Look for the last part that has the tag and attributes
-	parts = original_selector.split(">")
+	parts = [part.strip() for part in original_selector.split(">")]
 
 	# Find the part with our target element
 	for i in range(len(parts) - 1, -1, -1):
-		part = parts[i].strip()
-		if tag_name in part:
-			# Try to build a simpler selector from this part and maybe 1-2 parents
-			simplified_parts = []
-
-			# Add up to 2 parent levels for context
-			start_idx = max(0, i - 2)
-			for j in range(start_idx, len(parts)):
-				part_clean = parts[j].strip()
-				# Remove nth-of-type selectors that are too specific
-				part_clean = re.sub(r":nth-of-type\(\d+\)", "", part_clean)
-				part_clean = re.sub(r":nth-child\(\d+\)", "", part_clean)
-				if part_clean:
-					simplified_parts.append(part_clean)
-
+		if tag_name in parts[i]:
+			# Build a simpler selector from this part and up to 2 parents for context,
+			# removing nth-of-type/nth-child selectors that are too specific
+			simplified_parts = [
+				part_clean
+				for part_clean in (_NTH_RE.sub("", part) for part in parts[max(0, i - 2):])
+				if part_clean
+			]
 			if simplified_parts:
 				return " > ".join(simplified_parts)
 
@@ -1,4 +1,4 @@
-from typing import List, Literal, Optional, Union, Dict, Any
+from typing import List, Literal, Optional, Union, Dict, Any, get_args
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -159,6 +159,13 @@ DeterministicToolStep = Union[
 
 AgenticToolStep = AgentTaskToolStep
 
+# `type` tags of every SelectorToolSteps subclass, derived so new selector steps are picked up
+SELECTOR_STEP_TYPES = frozenset(
+	step_type
+	for step_cls in SelectorToolSteps.__subclasses__()
+	for step_type in get_args(step_cls.model_fields['type'].annotation)
+)
+
 
 ToolStep = Union[
 	# Pure tool
@@ -2,6 +2,11 @@ import logging
 import time
 from typing import Optional, Any
 
+
+def _noop(*args: Any, **kwargs: Any) -> None:
+    """Stand-in for the log methods of a disabled StepLogger."""
+
+
 class StepLogger:
     """
     Centralized logger for tool steps.
@@ -22,15 +27,28 @@ class StepLogger:
             self.logger.addHandler(handler)
             self.logger.setLevel(logging.INFO)
 
+        # Disabled loggers shadow their methods with a no-op, so per-step calls
+        # skip the bound-method setup and the enabled check entirely
+        if not enabled:
+            self.log_step_start = _noop
+            self.log_step_end = _noop
+            self.log_step_end_ns = _noop
+
+    @staticmethod
+    def now() -> int:
+        """Monotonic timestamp in nanoseconds; subtract two of these for `log_step_end_ns`."""
+        return time.perf_counter_ns()
+
     def log_step_start(self, step_index: int, step_type: str, description: Optional[str] = None):
         """Log the start of a step execution."""
-        if not self.enabled:
+        if not self.enabled or not self.logger.isEnabledFor(logging.INFO):
             return
-            
-        msg = f"START Step {step_index+1}: Type={step_type}"
+
+        # %-style arguments: the message is only formatted if a handler emits it
         if description:
-            msg += f", Desc='{description}'"
-        self.logger.info(msg)
+            self.logger.info("START Step %d: Type=%s, Desc='%s'", step_index + 1, step_type, description)
+        else:
+            self.logger.info("START Step %d: Type=%s", step_index + 1, step_type)
 
     def log_step_end(
         self, 
@@ -42,19 +60,47 @@ class StepLogger:
         error: Optional[str] = None
     ):
         """Log the completion of a step execution."""
-        if not self.enabled:
+        if not self.enabled or not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        self._emit_step_end(step_index, step_type, success, duration, current_url, error)
+
+    def log_step_end_ns(
+        self,
+        step_index: int,
+        step_type: str,
+        success: bool,
+        duration_ns: int,
+        current_url: str,
+        error: Optional[str] = None
+    ):
+        """Log the completion of a step execution timed with `now()`."""
+        if not self.enabled or not self.logger.isEnabledFor(logging.INFO):
             return
 
+        # Seconds are only derived once we know the record will be emitted
+        self._emit_step_end(step_index, step_type, success, duration_ns / 1e9, current_url, error)
+
+    def _emit_step_end(
+        self,
+        step_index: int,
+        step_type: str,
+        success: bool,
+        duration: float,
+        current_url: str,
+        error: Optional[str],
+    ):
         status = "SUCCESS" if success else "FAILURE"
-        msg = (
-            f"END Step {step_index+1}: Type={step_type}, Status={status}, "
-            f"Time={duration:.4f}s, URL='{current_url}'"
-        )
-        
         if error:
-            msg += f", Error='{error}'"
-            
-        self.logger.info(msg)
+            self.logger.info(
+                "END Step %d: Type=%s, Status=%s, Time=%.4fs, URL='%s', Error='%s'",
+                step_index + 1, step_type, status, duration, current_url, error,
+            )
+        else:
+            self.logger.info(
+                "END Step %d: Type=%s, Status=%s, Time=%.4fs, URL='%s'",
+                step_index + 1, step_type, status, duration, current_url,
+            )
 
 # Global instance or factory can be used if needed, 
 # but typically it will be instantiated in the executor with config.